@@ -1,6 +1,7 @@
 import logging
 import struct
 from typing import (
+    Any,
     ClassVar,
     Sequence,
     Tuple,
@@ -50,6 +51,20 @@ class Command(CommandAPI):
         return f"{type(self).__name__} (cmd_id={self.cmd_id})"
 
     def encode_payload(self, data: Union[Payload, sedes.CountableList]) -> bytes:
+        data = self._payload_values(data)
+        if isinstance(self.structure, sedes.CountableList):
+            encoder = self.structure
+        else:
+            encoder = sedes.List([type_ for _, type_ in self.structure])
+        return rlp.encode(data, sedes=encoder)
+
+    def _payload_values(self, data: Union[Payload, sedes.CountableList]) -> Any:
+        """
+        Return the given payload as a sequence of values in the order defined by our structure.
+
+        Callers that already have the values in that order can pass them as a tuple to skip the
+        dict validation and re-ordering.
+        """
         if isinstance(data, dict):
             if not isinstance(self.structure, tuple):
                 raise ValueError(
@@ -62,13 +77,8 @@ class Command(CommandAPI):
                 raise ValueError(
                     f"Keys in data dict ({data_keys}) do not match expected keys ({expected_keys})"
                 )
-            data = tuple(data[name] for name, _ in self.structure)
-
-        if isinstance(self.structure, sedes.CountableList):
-            encoder = self.structure
-        else:
-            encoder = sedes.List([type_ for _, type_ in self.structure])
-        return rlp.encode(data, sedes=encoder)
+            return tuple(data[name] for name, _ in self.structure)
+        return data
 
     def decode_payload(self, rlp_data: bytes) -> Payload:
         if isinstance(self.structure, sedes.CountableList):
@@ -112,7 +122,10 @@ class Command(CommandAPI):
             return raw_payload
 
     def compress_payload(self, raw_payload: bytes) -> bytes:
-        # Do the Snappy Compression only if Snappy Compression is supported by the protocol
+        # Do the Snappy Compression only if Snappy Compression is supported by the protocol.
+        # Note that we can't skip compression for small payloads (where snappy may even grow
+        # them slightly) because once it's negotiated the remote unconditionally decompresses
+        # every message it receives.
         if self.snappy_support:
             return snappy.compress(raw_payload)
         else:
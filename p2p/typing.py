@@ -13,6 +13,8 @@ Payload = Union[
     Dict[str, Any],
     Sequence[rlp.Serializable],
     TypedDictPayload,
+    # The values of a Command's structure, in order.
+    Tuple[Any, ...],
 ]
 
 
@@ -1,9 +1,30 @@
 import asyncio
 import pytest
 
+import rlp
+from rlp import sedes
+from rlp.exceptions import SerializationError
+
+from p2p.tools.factories import SessionFactory
+
+from trinity.protocol.les.commands import (
+    ContractCodeRequest,
+    GetBlockBodies,
+    GetBlockHeaders,
+    GetBlockHeadersQuery,
+    GetContractCodes,
+    GetProofs,
+    GetProofsV2,
+    GetReceipts,
+    ProofRequest,
+    Status,
+    StatusV2,
+)
+from trinity.protocol.les.constants import MAX_BODIES_FETCH
 from trinity.protocol.les.proto import (
     LESProtocol,
     LESProtocolV2,
+    ProxyLESProtocol,
 )
 
 from trinity.tools.factories import LESV2PeerPairFactory
@@ -61,3 +82,196 @@ async def test_les_protocol_methods_request_id(
         assert msg['request_id'] == request_id
     else:
         assert msg['request_id'] != request_id
+
+
+@pytest.mark.asyncio
+async def test_les_protocol_send_get_block_bodies_batch(les_peer_and_remote):
+    peer, remote = les_peer_and_remote
+    proto = remote.sub_proto
+    # LESProtocol doesn't handle incoming GetBlockBodies msgs, so capture and decode the frames
+    # as they're handed to the transport.
+    sent_frames = []
+    proto._send = lambda header, body: sent_frames.append((header, body))
+    block_hashes_batches = ([b'\x01' * 32], [], [b'\x02' * 32, b'\x03' * 32])
+
+    request_ids = proto.send_get_block_bodies_batch(block_hashes_batches)
+
+    assert len(request_ids) == len(block_hashes_batches)
+    assert len(sent_frames) == len(block_hashes_batches)
+    cmd = GetBlockBodies(proto.cmd_id_offset, proto.snappy_support)
+    for request_id, block_hashes, (header, body) in zip(
+            request_ids, block_hashes_batches, sent_frames):
+        frame_size = int.from_bytes(header[:3], 'big')
+        msg = cmd.decode(body[:frame_size])
+        assert msg['request_id'] == request_id
+        assert msg['block_hashes'] == tuple(block_hashes)
+
+
+@pytest.mark.asyncio
+async def test_les_protocol_send_get_block_bodies_batch_too_many(les_peer_and_remote):
+    peer, remote = les_peer_and_remote
+    proto = remote.sub_proto
+    sent_frames = []
+    proto._send = lambda header, body: sent_frames.append((header, body))
+    too_many_hashes = [b'\x01' * 32] * (MAX_BODIES_FETCH + 1)
+
+    with pytest.raises(ValueError):
+        proto.send_get_block_bodies_batch(([b'\x02' * 32], too_many_hashes))
+
+    assert sent_frames == []
+
+
+class RecordingEventBus:
+    def __init__(self):
+        self.events = []
+
+    def broadcast_nowait(self, event, config=None):
+        self.events.append(event)
+
+
+@pytest.mark.parametrize('request_id', (1, 1000, None))
+def test_proxy_les_protocol_send_block_headers_request_id(request_id):
+    event_bus = RecordingEventBus()
+    proxy_proto = ProxyLESProtocol(SessionFactory(), event_bus, None)
+
+    generated_request_id = proxy_proto.send_block_headers((), 0, request_id=request_id)
+
+    assert len(event_bus.events) == 1
+    event = event_bus.events[0]
+    assert event.request_id == generated_request_id
+    assert generated_request_id is not None
+    if request_id is not None:
+        assert generated_request_id == request_id
+
+
+@pytest.mark.parametrize(
+    'block_number_or_hash, max_headers, skip, reverse',
+    (
+        (0, 1, 0, False),
+        (1, 192, 0, False),
+        (2 ** 40, 192, 0, True),
+        (b'\x01' * 32, 1, 0, True),
+        (b'\x01' * 32, 0, 0, False),
+        (100, 10, 5, True),
+        (b'\x01' * 32, 10, 1, False),
+    ),
+)
+@pytest.mark.parametrize('request_id', (0, 1, 2 ** 64 - 1))
+def test_les_get_block_headers_encode_payload(
+        block_number_or_hash, max_headers, skip, reverse, request_id):
+    cmd = GetBlockHeaders(cmd_id_offset=16, snappy_support=False)
+    query = GetBlockHeadersQuery(block_number_or_hash, max_headers, skip, reverse)
+    expected = rlp.encode(
+        (request_id, query),
+        sedes=sedes.List([sedes.big_endian_int, GetBlockHeadersQuery]),
+    )
+
+    assert cmd.encode_payload((request_id, query)) == expected
+    assert cmd.encode_payload({'request_id': request_id, 'query': query}) == expected
+    assert cmd.decode_payload(expected)['request_id'] == request_id
+
+
+@pytest.mark.parametrize(
+    'skip, reverse',
+    (
+        (0, 0),
+        (0, 1),
+        (0, None),
+        (False, False),
+        (False, True),
+    ),
+)
+def test_les_get_block_headers_encode_payload_rejects_invalid_query(skip, reverse):
+    cmd = GetBlockHeaders(cmd_id_offset=16, snappy_support=False)
+    query = GetBlockHeadersQuery(1, 1, skip, reverse)
+
+    with pytest.raises(SerializationError):
+        cmd.encode_payload((1, query))
+
+
+@pytest.mark.parametrize('cmd_class', (Status, StatusV2))
+@pytest.mark.parametrize(
+    'optional_items',
+    (
+        {},
+        {'serveHeaders': None, 'txRelay': None, 'serveChainSince': 0},
+        {'flowControl/BL': 300000, 'flowControl/MRR': 10, 'flowControl/MRC': ((2, 0, 10),)},
+        {'flowControl/MRC': [(2, 0, 10), (3, 1, 20)]},
+        {'flowControl/MRC': ((2, 0, 10), [3, 1, 20])},
+    ),
+)
+def test_les_status_encode_payload(cmd_class, optional_items):
+    cmd = cmd_class(cmd_id_offset=16, snappy_support=False)
+    payload = dict(
+        protocolVersion=2,
+        networkId=1,
+        headTd=2 ** 70,
+        headHash=b'\x01' * 32,
+        headNum=1000,
+        genesisHash=b'\x02' * 32,
+        **optional_items,
+    )
+    if cmd_class is StatusV2:
+        payload['announceType'] = 1
+    expected = rlp.encode(
+        [
+            (key, b'' if value is None else cmd.items_sedes[key].serialize(value))
+            for key, value in sorted(payload.items())
+        ],
+        sedes=cmd.structure,
+    )
+
+    # Encode twice so that the cached encodings of the static items are used as well.
+    assert cmd.encode_payload(payload) == expected
+    assert cmd.encode_payload(payload) == expected
+
+
+HASH_A = b'\x01' * 32
+HASH_B = b'\x02' * 32
+
+
+@pytest.mark.parametrize(
+    'cmd_class, key, item_sedes, items',
+    (
+        (GetBlockBodies, 'block_hashes', sedes.binary, []),
+        (GetBlockBodies, 'block_hashes', sedes.binary, [HASH_A, HASH_B]),
+        (GetBlockBodies, 'block_hashes', sedes.binary, (HASH_A,) * 192),
+        (GetReceipts, 'block_hashes', sedes.binary, []),
+        (GetReceipts, 'block_hashes', sedes.binary, [HASH_A]),
+        (GetProofs, 'proof_requests', ProofRequest, []),
+        (GetProofs, 'proof_requests', ProofRequest, [ProofRequest(HASH_A, HASH_B, b'', 0)]),
+        (
+            GetProofsV2,
+            'proof_requests',
+            ProofRequest,
+            [
+                ProofRequest(HASH_A, HASH_B, HASH_A, 0),
+                ProofRequest(HASH_B, b'', HASH_A, 1),
+                ProofRequest(HASH_A, HASH_B, b'\x08', 2 ** 20),
+            ],
+        ),
+        (GetContractCodes, 'code_requests', ContractCodeRequest, []),
+        (
+            GetContractCodes,
+            'code_requests',
+            ContractCodeRequest,
+            [ContractCodeRequest(HASH_A, b'')],
+        ),
+        (
+            GetContractCodes,
+            'code_requests',
+            ContractCodeRequest,
+            [ContractCodeRequest(HASH_A, HASH_B), ContractCodeRequest(HASH_B, b'\x04')],
+        ),
+    ),
+)
+@pytest.mark.parametrize('request_id', (0, 1, 2 ** 64 - 1))
+def test_les_request_list_encode_payload(cmd_class, key, item_sedes, items, request_id):
+    cmd = cmd_class(cmd_id_offset=16, snappy_support=False)
+    expected = rlp.encode(
+        (request_id, items),
+        sedes=sedes.List([sedes.big_endian_int, sedes.CountableList(item_sedes)]),
+    )
+
+    assert cmd.encode_payload((request_id, items)) == expected
+    assert cmd.encode_payload({'request_id': request_id, key: items}) == expected
@@ -0,0 +1,12 @@
+import pytest
+
+from trinity._utils.les import gen_request_ids
+
+
+@pytest.mark.parametrize('count', (0, 1, 2, 128))
+def test_gen_request_ids(count):
+    request_ids = gen_request_ids(count)
+
+    assert len(request_ids) == count
+    assert len(set(request_ids)) == count
+    assert all(0 <= request_id < 2 ** 64 for request_id in request_ids)
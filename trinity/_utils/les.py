@@ -1,7 +1,16 @@
 import os
+from typing import Tuple
 
 from eth_utils import big_endian_to_int
 
 
 def gen_request_id() -> int:
     return big_endian_to_int(os.urandom(8))
+
+
+def gen_request_ids(count: int) -> Tuple[int, ...]:
+    randomness = os.urandom(8 * count)
+    return tuple(
+        big_endian_to_int(randomness[offset:offset + 8])
+        for offset in range(0, 8 * count, 8)
+    )
@@ -1,9 +1,12 @@
+import functools
+import sys
 from typing import (
     Any,
     cast,
     Dict,
     Iterator,
     List,
+    Sequence,
     Tuple,
     Union,
 )
@@ -14,6 +17,7 @@ from eth_utils import (
 
 import rlp
 from rlp import sedes
+from rlp.codec import encode_raw, length_prefix
 
 from eth.rlp.headers import BlockHeader
 from eth.rlp.receipts import Receipt
@@ -25,6 +29,27 @@ from trinity.rlp.block_body import BlockBody
 from trinity.rlp.sedes import HashOrNumber
 
 
+# Keys of the optional Status items, shared with LESHandshakeParams. Literals containing a '/'
+# are not interned automatically, so we do it here to make the dict lookups done on them when
+# encoding the Status msg cheaper.
+STATUS_SERVE_HEADERS = sys.intern('serveHeaders')
+STATUS_SERVE_CHAIN_SINCE = sys.intern('serveChainSince')
+STATUS_SERVE_STATE_SINCE = sys.intern('serveStateSince')
+STATUS_SERVE_RECENT_CHAIN = sys.intern('serveRecentChain')
+STATUS_SERVE_RECENT_STATE = sys.intern('serveRecentState')
+STATUS_TX_RELAY = sys.intern('txRelay')
+STATUS_FLOW_CONTROL_BL = sys.intern('flowControl/BL')
+STATUS_FLOW_CONTROL_MRC = sys.intern('flowControl/MRC')
+STATUS_FLOW_CONTROL_MRR = sys.intern('flowControl/MRR')
+STATUS_ANNOUNCE_TYPE = sys.intern('announceType')
+
+
+def _encode_block_hashes_payload(request_id: int, block_hashes: Sequence[bytes]) -> bytes:
+    # The block hashes are already bytes, so only the request_id needs serializing and the rest
+    # can be handed straight to the raw encoder, bypassing the sedes reflection.
+    return encode_raw([sedes.big_endian_int.serialize(request_id), block_hashes])
+
+
 class Status(Command):
     _cmd_id = 0
     decode_strict = False
@@ -41,15 +66,17 @@ class Status(Command):
         'headHash': sedes.binary,
         'headNum': sedes.big_endian_int,
         'genesisHash': sedes.binary,
-        'serveHeaders': None,
-        'serveChainSince': sedes.big_endian_int,
-        'serveStateSince': sedes.big_endian_int,
-        'txRelay': None,
-        'flowControl/BL': sedes.big_endian_int,
-        'flowControl/MRC': sedes.CountableList(
+        STATUS_SERVE_HEADERS: None,
+        STATUS_SERVE_CHAIN_SINCE: sedes.big_endian_int,
+        STATUS_SERVE_STATE_SINCE: sedes.big_endian_int,
+        STATUS_TX_RELAY: None,
+        STATUS_FLOW_CONTROL_BL: sedes.big_endian_int,
+        STATUS_FLOW_CONTROL_MRC: sedes.CountableList(
             sedes.List([sedes.big_endian_int, sedes.big_endian_int, sedes.big_endian_int])),
-        'flowControl/MRR': sedes.big_endian_int,
+        STATUS_FLOW_CONTROL_MRR: sedes.big_endian_int,
     }
+    # The keys whose values change as our chain head moves.
+    head_keys = frozenset(('headTd', 'headHash', 'headNum'))
 
     @to_dict
     def decode_payload(self, rlp_data: bytes) -> Iterator[Tuple[str, Any]]:
@@ -64,12 +91,34 @@ class Status(Command):
             yield key, self._deserialize_item(key, value)
 
     def encode_payload(self, data: Union[Payload, sedes.CountableList]) -> bytes:
-        response = [
-            (key, self._serialize_item(key, value))
+        # Every item is RLP-encoded individually, so we only need to wrap them in a list prefix.
+        # Most items are the same for every peer we handshake with, so their encodings are cached
+        # and only the ones that depend on our current head are encoded every time.
+        encoded_items = b''.join(
+            self._encode_item(key, value)
+            if key in self.head_keys
+            else self._encode_static_item(key, value)
             for key, value
             in sorted(cast(Dict[str, Any], data).items())
-        ]
-        return super().encode_payload(response)
+        )
+        return length_prefix(len(encoded_items), 0xc0) + encoded_items
+
+    @classmethod
+    def _encode_static_item(cls, key: str, value: Any) -> bytes:
+        try:
+            return cls._encode_cached_item(key, value)
+        except TypeError:
+            # The value is not hashable (e.g. it contains a list), so it can't be cached.
+            return cls._encode_item(key, value)
+
+    @classmethod
+    @functools.lru_cache(maxsize=64, typed=True)
+    def _encode_cached_item(cls, key: str, value: Any) -> bytes:
+        return cls._encode_item(key, value)
+
+    @classmethod
+    def _encode_item(cls, key: str, value: Any) -> bytes:
+        return encode_raw([key.encode('utf8'), cls._serialize_item(key, value)])
 
     def _deserialize_item(self, key: str, value: bytes) -> Any:
         sedes = self.items_sedes[key]
@@ -79,8 +128,9 @@ class Status(Command):
             # See comment in the definition of item_sedes as to why we do this.
             return b''
 
-    def _serialize_item(self, key: str, value: bytes) -> bytes:
-        sedes = self.items_sedes[key]
+    @classmethod
+    def _serialize_item(cls, key: str, value: bytes) -> bytes:
+        sedes = cls.items_sedes[key]
         if sedes is not None:
             return sedes.serialize(value)
         else:
@@ -110,6 +160,18 @@ class GetBlockHeadersQuery(rlp.Serializable):
     )
 
 
+# The RLP encoding of the trailing (skip, reverse) items of a GetBlockHeadersQuery with skip=0,
+# indexed by the value of reverse.
+_ZERO_SKIP_QUERY_TAILS = {
+    reverse: (
+        encode_raw(sedes.big_endian_int.serialize(0)) +
+        encode_raw(sedes.boolean.serialize(reverse))
+    )
+    for reverse in (False, True)
+}
+_hash_or_number = HashOrNumber()
+
+
 class GetBlockHeaders(Command):
     _cmd_id = 2
     structure = (
@@ -117,6 +179,26 @@ class GetBlockHeaders(Command):
         ('query', GetBlockHeadersQuery),
     )
 
+    def encode_payload(self, data: Union[Payload, sedes.CountableList]) -> bytes:
+        request_id, query = self._payload_values(data)
+        if not (type(query.skip) is int and query.skip == 0 and isinstance(query.reverse, bool)):
+            return super().encode_payload((request_id, query))
+
+        # Both forward and backward syncing use skip=0, so in that case the query only has two
+        # items that actually need encoding and we can build the payload by hand. Values of other
+        # types for skip/reverse go through the sedes above so that they're rejected as before.
+        encoded_query_items = b''.join((
+            encode_raw(_hash_or_number.serialize(query.block_number_or_hash)),
+            encode_raw(sedes.big_endian_int.serialize(query.max_headers)),
+            _ZERO_SKIP_QUERY_TAILS[query.reverse],
+        ))
+        encoded_items = b''.join((
+            encode_raw(sedes.big_endian_int.serialize(request_id)),
+            length_prefix(len(encoded_query_items), 0xc0),
+            encoded_query_items,
+        ))
+        return length_prefix(len(encoded_items), 0xc0) + encoded_items
+
 
 class BlockHeaders(Command):
     _cmd_id = 3
@@ -134,6 +216,9 @@ class GetBlockBodies(Command):
         ('block_hashes', sedes.CountableList(sedes.binary)),
     )
 
+    def encode_payload(self, data: Union[Payload, sedes.CountableList]) -> bytes:
+        return _encode_block_hashes_payload(*self._payload_values(data))
+
 
 class BlockBodies(Command):
     _cmd_id = 5
@@ -151,6 +236,9 @@ class GetReceipts(Command):
         ('block_hashes', sedes.CountableList(sedes.binary)),
     )
 
+    def encode_payload(self, data: Union[Payload, sedes.CountableList]) -> bytes:
+        return _encode_block_hashes_payload(*self._payload_values(data))
+
 
 class Receipts(Command):
     _cmd_id = 7
@@ -177,6 +265,23 @@ class GetProofs(Command):
         ('proof_requests', sedes.CountableList(ProofRequest)),
     )
 
+    def encode_payload(self, data: Union[Payload, sedes.CountableList]) -> bytes:
+        request_id, proof_requests = self._payload_values(data)
+        # All ProofRequest fields but from_level are already bytes, so serialize that one
+        # ourselves and skip the sedes reflection for the rest.
+        return encode_raw([
+            sedes.big_endian_int.serialize(request_id),
+            [
+                [
+                    proof_request.block_hash,
+                    proof_request.account_key,
+                    proof_request.key,
+                    sedes.big_endian_int.serialize(proof_request.from_level),
+                ]
+                for proof_request in proof_requests
+            ],
+        ])
+
 
 class Proofs(Command):
     _cmd_id = 9
@@ -213,6 +318,17 @@ class GetContractCodes(Command):
         ('code_requests', sedes.CountableList(ContractCodeRequest)),
     )
 
+    def encode_payload(self, data: Union[Payload, sedes.CountableList]) -> bytes:
+        request_id, code_requests = self._payload_values(data)
+        # ContractCodeRequest fields are all bytes, so no sedes are needed to encode them.
+        return encode_raw([
+            sedes.big_endian_int.serialize(request_id),
+            [
+                [code_request.block_hash, code_request.key]
+                for code_request in code_requests
+            ],
+        ])
+
 
 class ContractCodes(Command):
     _cmd_id = 11
@@ -228,7 +344,7 @@ class StatusV2(Status):
 
     def __init__(self, cmd_id_offset: int, snappy_support: bool) -> None:
         super().__init__(cmd_id_offset, snappy_support)
-        self.items_sedes['announceType'] = sedes.big_endian_int
+        self.items_sedes[STATUS_ANNOUNCE_TYPE] = sedes.big_endian_int
 
 
 class GetProofsV2(GetProofs):
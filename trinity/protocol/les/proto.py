@@ -1,10 +1,11 @@
 from typing import (
     Any,
-    Iterable,
+    Dict,
     List,
-    NamedTuple,
     Optional,
+    Sequence,
     Tuple,
+    Type,
     TYPE_CHECKING,
     Union,
 )
@@ -20,19 +21,28 @@ from eth_typing import (
 )
 
 from eth_utils import (
-    to_dict,
     ValidationError,
 )
 
 from eth.rlp.headers import BlockHeader
 
-from p2p.abc import SessionAPI
+from p2p.abc import SessionAPI, TransportAPI
 from p2p.protocol import Protocol
 from p2p.typing import Payload
 
-from trinity._utils.les import gen_request_id
+from trinity._utils.les import gen_request_id, gen_request_ids
 
 from .commands import (
+    STATUS_SERVE_HEADERS,
+    STATUS_SERVE_CHAIN_SINCE,
+    STATUS_SERVE_STATE_SINCE,
+    STATUS_SERVE_RECENT_CHAIN,
+    STATUS_SERVE_RECENT_STATE,
+    STATUS_TX_RELAY,
+    STATUS_FLOW_CONTROL_BL,
+    STATUS_FLOW_CONTROL_MRC,
+    STATUS_FLOW_CONTROL_MRR,
+    STATUS_ANNOUNCE_TYPE,
     Status,
     StatusV2,
     Announce,
@@ -59,55 +69,110 @@ if TYPE_CHECKING:
     from .peer import LESPeer  # noqa: F401
 
 
-class LESHandshakeParams(NamedTuple):
-    version: int
-    network_id: int
-    head_td: int
-    head_hash: Hash32
-    head_number: BlockNumber
-    genesis_hash: Hash32
-    serve_headers: bool
-    serve_chain_since: Optional[BlockNumber]
-    serve_state_since: Optional[BlockNumber]
-    serve_recent_state: Optional[bool]
-    serve_recent_chain: Optional[bool]
-    tx_relay: bool
-    flow_control_bl: Optional[int]
-    flow_control_mcr: Optional[Tuple[Tuple[int, int, int], ...]]
-    flow_control_mrr: Optional[int]
-    announce_type: Optional[int]
+def _resolve_request_id(request_id: Optional[int]) -> int:
+    if request_id is None:
+        return gen_request_id()
+    return request_id
+
+
+def _validate_block_bodies_fetch_size(block_hashes: Sequence[bytes]) -> None:
+    if len(block_hashes) > constants.MAX_BODIES_FETCH:
+        raise ValueError(
+            f"Cannot ask for more than {constants.MAX_BODIES_FETCH} blocks in a single request"
+        )
+
+
+class LESHandshakeParams:
+    __slots__ = (
+        'version',
+        'network_id',
+        'head_td',
+        'head_hash',
+        'head_number',
+        'genesis_hash',
+        'serve_headers',
+        'serve_chain_since',
+        'serve_state_since',
+        'serve_recent_state',
+        'serve_recent_chain',
+        'tx_relay',
+        'flow_control_bl',
+        'flow_control_mcr',
+        'flow_control_mrr',
+        'announce_type',
+    )
+
+    def __init__(self,
+                 version: int,
+                 network_id: int,
+                 head_td: int,
+                 head_hash: Hash32,
+                 head_number: BlockNumber,
+                 genesis_hash: Hash32,
+                 serve_headers: bool,
+                 serve_chain_since: Optional[BlockNumber],
+                 serve_state_since: Optional[BlockNumber],
+                 serve_recent_state: Optional[bool],
+                 serve_recent_chain: Optional[bool],
+                 tx_relay: bool,
+                 flow_control_bl: Optional[int],
+                 flow_control_mcr: Optional[Tuple[Tuple[int, int, int], ...]],
+                 flow_control_mrr: Optional[int],
+                 announce_type: Optional[int]) -> None:
+        self.version = version
+        self.network_id = network_id
+        self.head_td = head_td
+        self.head_hash = head_hash
+        self.head_number = head_number
+        self.genesis_hash = genesis_hash
+        self.serve_headers = serve_headers
+        self.serve_chain_since = serve_chain_since
+        self.serve_state_since = serve_state_since
+        self.serve_recent_state = serve_recent_state
+        self.serve_recent_chain = serve_recent_chain
+        self.tx_relay = tx_relay
+        self.flow_control_bl = flow_control_bl
+        self.flow_control_mcr = flow_control_mcr
+        self.flow_control_mrr = flow_control_mrr
+        self.announce_type = announce_type
+
+    def __repr__(self) -> str:
+        params = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({params})"
 
     def as_payload_dict(self) -> Payload:
         return self._as_payload_dict()
 
-    @to_dict
-    def _as_payload_dict(self) -> Iterable[Tuple[str, Any]]:
-        yield 'protocolVersion', self.version
-        yield 'networkId', self.network_id
-        yield 'headTd', self.head_td
-        yield 'headHash', self.head_hash
-        yield 'headNum', self.head_number
-        yield 'genesisHash', self.genesis_hash
+    def _as_payload_dict(self) -> Dict[str, Any]:
+        payload = {
+            'protocolVersion': self.version,
+            'networkId': self.network_id,
+            'headTd': self.head_td,
+            'headHash': self.head_hash,
+            'headNum': self.head_number,
+            'genesisHash': self.genesis_hash,
+        }
         if self.serve_headers is True:
-            yield 'serveHeaders', None
+            payload[STATUS_SERVE_HEADERS] = None
         if self.serve_chain_since is not None:
-            yield 'serveChainSince', self.serve_chain_since
+            payload[STATUS_SERVE_CHAIN_SINCE] = self.serve_chain_since
         if self.serve_state_since is not None:
-            yield 'serveStateSince', self.serve_state_since
+            payload[STATUS_SERVE_STATE_SINCE] = self.serve_state_since
         if self.serve_recent_chain is not None:
-            yield 'serveRecentChain', self.serve_recent_chain
+            payload[STATUS_SERVE_RECENT_CHAIN] = self.serve_recent_chain
         if self.serve_recent_state is not None:
-            yield 'serveRecentState', self.serve_recent_state
+            payload[STATUS_SERVE_RECENT_STATE] = self.serve_recent_state
         if self.tx_relay is True:
-            yield 'txRelay', None
+            payload[STATUS_TX_RELAY] = None
         if self.flow_control_bl is not None:
-            yield "flowControl/BL", self.flow_control_bl
+            payload[STATUS_FLOW_CONTROL_BL] = self.flow_control_bl
         if self.flow_control_mcr is not None:
-            yield "flowControl/MRC", self.flow_control_mcr
+            payload[STATUS_FLOW_CONTROL_MRC] = self.flow_control_mcr
         if self.flow_control_mrr is not None:
-            yield "flowControl/MRR", self.flow_control_mrr
+            payload[STATUS_FLOW_CONTROL_MRR] = self.flow_control_mrr
         if self.announce_type is not None:
-            yield "announceType", self.announce_type
+            payload[STATUS_ANNOUNCE_TYPE] = self.announce_type
+        return payload
 
 
 class LESProtocol(Protocol):
@@ -124,6 +189,24 @@ class LESProtocol(Protocol):
     )
     cmd_length = 15
     peer: 'LESPeer'
+    # The commands that differ between LES versions.
+    _status_cmd_cls: Type[Status] = Status
+    _get_proofs_cmd_cls: Type[GetProofs] = GetProofs
+
+    def __init__(self, transport: TransportAPI, cmd_id_offset: int, snappy_support: bool) -> None:
+        super().__init__(transport, cmd_id_offset, snappy_support)
+        # The cmd_id_offset and snappy_support never change, so reuse the command instances built
+        # for our _commands, and build the remaining ones we send once instead of on every
+        # send_*() call.
+        self._cmd_status = self.cmd_by_type[self._status_cmd_cls]
+        self._cmd_get_block_headers = self.cmd_by_type[GetBlockHeaders]
+        self._cmd_block_headers = self.cmd_by_type[BlockHeaders]
+        self._cmd_get_block_bodies = GetBlockBodies(cmd_id_offset, snappy_support)
+        self._cmd_get_receipts = GetReceipts(cmd_id_offset, snappy_support)
+        self._cmd_get_proofs = self._get_proofs_cmd_cls(cmd_id_offset, snappy_support)
+        self._cmd_get_contract_codes = GetContractCodes(cmd_id_offset, snappy_support)
+        # Bind the transport's send() once as well, to save the attribute lookups on every send.
+        self._send = transport.send
 
     def send_handshake(self, handshake_params: LESHandshakeParams) -> None:
         if handshake_params.version != self.version:
@@ -132,26 +215,34 @@ class LESProtocol(Protocol):
                 f"params:{handshake_params.version} != proto:{self.version}"
             )
         resp = handshake_params.as_payload_dict()
-        cmd = Status(self.cmd_id_offset, self.snappy_support)
-        self.transport.send(*cmd.encode(resp))
+        self._send(*self._cmd_status.encode(resp))
         self.logger.debug("Sending LES/Status msg: %s", resp)
 
     def send_get_block_bodies(self, block_hashes: List[bytes], request_id: int=None) -> int:
-        if request_id is None:
-            request_id = gen_request_id()
-        if len(block_hashes) > constants.MAX_BODIES_FETCH:
-            raise ValueError(
-                f"Cannot ask for more than {constants.MAX_BODIES_FETCH} blocks in a single request"
-            )
-        data = {
-            'request_id': request_id,
-            'block_hashes': block_hashes,
-        }
-        header, body = GetBlockBodies(self.cmd_id_offset, self.snappy_support).encode(data)
-        self.transport.send(header, body)
+        request_id = _resolve_request_id(request_id)
+        _validate_block_bodies_fetch_size(block_hashes)
+        header, body = self._cmd_get_block_bodies.encode((request_id, block_hashes))
+        self._send(header, body)
 
         return request_id
 
+    def send_get_block_bodies_batch(
+            self, block_hashes_batches: Sequence[List[bytes]]) -> Tuple[int, ...]:
+        """Send one GetBlockBodies msg for each of the given lists of block hashes.
+
+        Returns the request IDs of the msgs sent, in the same order as the given lists. Nothing
+        is sent if any of the lists is too long.
+        """
+        for block_hashes in block_hashes_batches:
+            _validate_block_bodies_fetch_size(block_hashes)
+        request_ids = gen_request_ids(len(block_hashes_batches))
+        encode = self._cmd_get_block_bodies.encode
+        send = self._send
+        for request_id, block_hashes in zip(request_ids, block_hashes_batches):
+            send(*encode((request_id, block_hashes)))
+
+        return request_ids
+
     def send_get_block_headers(
             self,
             block_number_or_hash: Union[BlockNumber, Hash32],
@@ -165,71 +256,42 @@ class LESProtocol(Protocol):
         block_number_or_hash if reverse is False or ending at block_number_or_hash if reverse is
         True.
         """
-        if request_id is None:
-            request_id = gen_request_id()
-        cmd = GetBlockHeaders(self.cmd_id_offset, self.snappy_support)
-        data = {
-            'request_id': request_id,
-            'query': GetBlockHeadersQuery(
-                block_number_or_hash,
-                max_headers,
-                skip,
-                reverse,
-            ),
-        }
-        header, body = cmd.encode(data)
-        self.transport.send(header, body)
+        request_id = _resolve_request_id(request_id)
+        query = GetBlockHeadersQuery(block_number_or_hash, max_headers, skip, reverse)
+        header, body = self._cmd_get_block_headers.encode((request_id, query))
+        self._send(header, body)
 
         return request_id
 
     def send_block_headers(
             self, headers: Tuple[BlockHeader, ...], buffer_value: int, request_id: int=None) -> int:
-        if request_id is None:
-            request_id = gen_request_id()
-        data = {
-            'request_id': request_id,
-            'headers': headers,
-            'buffer_value': buffer_value,
-        }
-        header, body = BlockHeaders(self.cmd_id_offset, self.snappy_support).encode(data)
-        self.transport.send(header, body)
+        request_id = _resolve_request_id(request_id)
+        header, body = self._cmd_block_headers.encode((request_id, buffer_value, headers))
+        self._send(header, body)
 
         return request_id
 
     def send_get_receipts(self, block_hash: bytes, request_id: int=None) -> int:
-        if request_id is None:
-            request_id = gen_request_id()
-        data = {
-            'request_id': request_id,
-            'block_hashes': [block_hash],
-        }
-        header, body = GetReceipts(self.cmd_id_offset, self.snappy_support).encode(data)
-        self.transport.send(header, body)
+        request_id = _resolve_request_id(request_id)
+        header, body = self._cmd_get_receipts.encode((request_id, [block_hash]))
+        self._send(header, body)
 
         return request_id
 
     def send_get_proof(self, block_hash: bytes, account_key: bytes, key: bytes, from_level: int,
                        request_id: int=None) -> int:
-        if request_id is None:
-            request_id = gen_request_id()
-        data = {
-            'request_id': request_id,
-            'proof_requests': [ProofRequest(block_hash, account_key, key, from_level)],
-        }
-        header, body = GetProofs(self.cmd_id_offset, self.snappy_support).encode(data)
-        self.transport.send(header, body)
+        request_id = _resolve_request_id(request_id)
+        proof_requests = [ProofRequest(block_hash, account_key, key, from_level)]
+        header, body = self._cmd_get_proofs.encode((request_id, proof_requests))
+        self._send(header, body)
 
         return request_id
 
     def send_get_contract_code(self, block_hash: bytes, key: bytes, request_id: int=None) -> int:
-        if request_id is None:
-            request_id = gen_request_id()
-        data = {
-            'request_id': request_id,
-            'code_requests': [ContractCodeRequest(block_hash, key)],
-        }
-        header, body = GetContractCodes(self.cmd_id_offset, self.snappy_support).encode(data)
-        self.transport.send(header, body)
+        request_id = _resolve_request_id(request_id)
+        code_requests = [ContractCodeRequest(block_hash, key)]
+        header, body = self._cmd_get_contract_codes.encode((request_id, code_requests))
+        self._send(header, body)
 
         return request_id
 
@@ -246,34 +308,8 @@ class LESProtocolV2(LESProtocol):
         ContractCodes,
     )
     cmd_length = 21
-
-    def send_handshake(self, handshake_params: LESHandshakeParams) -> None:
-        if handshake_params.version != self.version:
-            raise ValidationError(
-                f"LES protocol version mismatch: "
-                f"params:{handshake_params.version} != proto:{self.version}"
-            )
-        resp = handshake_params.as_payload_dict()
-        cmd = StatusV2(self.cmd_id_offset, self.snappy_support)
-        self.logger.debug("Sending LES/Status msg: %s", resp)
-        self.transport.send(*cmd.encode(resp))
-
-    def send_get_proof(self,
-                       block_hash: bytes,
-                       account_key: bytes,
-                       key: bytes,
-                       from_level: int,
-                       request_id: int=None) -> int:
-        if request_id is None:
-            request_id = gen_request_id()
-        data = {
-            'request_id': request_id,
-            'proof_requests': [ProofRequest(block_hash, account_key, key, from_level)],
-        }
-        header, body = GetProofsV2(self.cmd_id_offset, self.snappy_support).encode(data)
-        self.transport.send(header, body)
-
-        return request_id
+    _status_cmd_cls = StatusV2
+    _get_proofs_cmd_cls = GetProofsV2
 
 
 class ProxyLESProtocol:
@@ -309,13 +345,15 @@ class ProxyLESProtocol:
                            buffer_value: int,
                            request_id: int=None) -> int:
 
-        req_id = request_id if not None else gen_request_id()
-
+        request_id = _resolve_request_id(request_id)
+        # A new event is needed on every call: broadcast_nowait() only queues it, and in-process
+        # subscribers get the very same object, so reusing (and mutating) a pooled instance would
+        # change msgs that haven't been delivered yet.
         self._event_bus.broadcast_nowait(
-            SendBlockHeadersEvent(self.session, headers, buffer_value, req_id),
+            SendBlockHeadersEvent(self.session, headers, buffer_value, request_id),
             self._broadcast_config,
         )
-        return req_id
+        return request_id
 
     def send_get_receipts(self, block_hash: bytes, request_id: int=None) -> int:
         raise NotImplementedError("API not implemented")